@@ -10,10 +10,19 @@ Run this Thursday morning to catch the previous night's show.
 """
 
 import argparse
+import json
 import os
 import sys
 import base64
-from datetime import datetime, timedelta, timezone
+import tempfile
+import bisect
+import heapq
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import urlparse, parse_qs
 from zoneinfo import ZoneInfo
 
@@ -60,6 +69,25 @@ SHOW_DAY_OF_WEEK = 2   # Wednesday (0=Mon ... 6=Sun)
 SHOW_START_HOUR = 19    # 7 PM local
 SHOW_END_HOUR = 21      # 9 PM local
 
+# Local HTTP service (`serve` subcommand)
+SERVE_HOST = "127.0.0.1"
+SERVE_PORT = 8035
+SERVE_CACHE_SIZE = 32       # number of show windows kept in memory
+SERVE_CACHE_TTL = 15 * 60   # seconds before a cached setlist is re-fetched
+
+# Per-run checkpoints so a failed run resumes instead of starting over
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", ".ad_radio_state.json")
+CHECKPOINT_KEEP = 8             # most recent show windows kept in the state file
+PLAYLIST_BATCH_SIZE = 100       # Spotify's limit on URIs per playlist request
+
+# Adaptive timeouts and hedged GETs
+LATENCY_WINDOW = 200            # recent samples kept per endpoint
+LATENCY_MIN_SAMPLES = 20        # below this, use the fixed default timeout and don't hedge
+ADAPTIVE_TIMEOUT_MULTIPLIER = 3  # timeout = p99 * multiplier, capped at the default
+ADAPTIVE_TIMEOUT_FLOOR = 2.0    # seconds; never time out faster than this
+HEDGE_BUDGET_RATIO = 0.1        # at most ~10% extra requests from hedging
+HEDGE_BUDGET_BURST = 3          # hedges that can be spent before the ratio applies
+
 
 # ---------------------------------------------------------------------------
 # Spotify auth
@@ -99,6 +127,178 @@ def get_auth_headers():
     return {"Authorization": f"Bearer {token}"}
 
 
+# ---------------------------------------------------------------------------
+# Adaptive timeouts and hedged GETs
+# ---------------------------------------------------------------------------
+
+class EndpointLatency:
+    """
+    Recent latency samples and hedge budget for one upstream endpoint.
+
+    Once LATENCY_MIN_SAMPLES are in, the timeout tracks the observed p99
+    (times ADAPTIVE_TIMEOUT_MULTIPLIER, between ADAPTIVE_TIMEOUT_FLOOR and
+    default_timeout) and hedged_get fires a duplicate request after p95.
+    Every request earns HEDGE_BUDGET_RATIO of a token and every hedge costs
+    one, so hedging adds at most that fraction of extra load.
+    """
+
+    def __init__(self, name, default_timeout):
+        self.name = name
+        self.default_timeout = default_timeout
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._samples = deque(maxlen=LATENCY_WINDOW)
+            self._tokens = float(HEDGE_BUDGET_BURST)
+            self.requests = 0
+            self.hedges = 0
+            self.hedge_wins = 0
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q):
+        """Return the q-th percentile latency in seconds, or None without enough samples."""
+        with self._lock:
+            if len(self._samples) < LATENCY_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def timeout(self):
+        p99 = self.percentile(99)
+        if p99 is None:
+            return self.default_timeout
+        adaptive = max(ADAPTIVE_TIMEOUT_FLOOR, p99 * ADAPTIVE_TIMEOUT_MULTIPLIER)
+        return min(self.default_timeout, adaptive)
+
+    def hedge_delay(self):
+        return self.percentile(95)
+
+    def start_request(self):
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(HEDGE_BUDGET_BURST, self._tokens + HEDGE_BUDGET_RATIO)
+
+    def try_spend_hedge(self):
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.hedges += 1
+            return True
+
+    def record_hedge_win(self):
+        with self._lock:
+            self.hedge_wins += 1
+
+    def stats(self):
+        p50, p95, p99 = (self.percentile(q) for q in (50, 95, 99))
+        timeout = self.timeout()
+        with self._lock:
+            return {
+                "samples": len(self._samples),
+                "p50": p50,
+                "p95": p95,
+                "p99": p99,
+                "timeout": timeout,
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+            }
+
+
+ENDPOINT_LATENCY = {
+    "spotify_me": EndpointLatency("spotify_me", default_timeout=10),
+    "spotify_search": EndpointLatency("spotify_search", default_timeout=10),
+    "xmplaylist_page": EndpointLatency("xmplaylist_page", default_timeout=15),
+}
+
+def _start_daemon(fn, *args):
+    """
+    Run fn(*args) on a daemon thread and return a Future for its result.
+
+    Each call gets its own thread rather than sharing a pool: a losing
+    request must not hold up interpreter exit, and in serve mode a hedge
+    must not queue behind other handlers' stuck requests.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="hedged-get", daemon=True).start()
+    return future
+
+
+def _timed_get(endpoint, url, timeout, kwargs):
+    started = time.monotonic()
+    try:
+        resp = requests.get(url, timeout=timeout, **kwargs)
+    except requests.Timeout:
+        endpoint.record(time.monotonic() - started)
+        raise
+    endpoint.record(time.monotonic() - started)
+    return resp
+
+
+def hedged_get(endpoint_name, url, **kwargs):
+    """
+    requests.get with an adaptive timeout and, for slow responses, a hedge.
+
+    Only for idempotent GETs: if the first request hasn't answered by the
+    endpoint's p95 latency and the hedge budget allows, a duplicate is sent
+    and whichever responds first is returned. The loser is left to finish in
+    the background (requests can't be cancelled) and still counts as a sample.
+
+    If the adaptive timeout is tighter than the endpoint's default and
+    expires, the request is retried once with the default timeout, so a slow
+    but healthy upstream still succeeds. Errors propagate as the usual
+    requests exceptions.
+    """
+    endpoint = ENDPOINT_LATENCY[endpoint_name]
+    timeout = endpoint.timeout()
+    delay = endpoint.hedge_delay()
+    endpoint.start_request()
+
+    try:
+        return _hedged_attempt(endpoint, url, timeout, delay, kwargs)
+    except requests.Timeout:
+        if timeout >= endpoint.default_timeout:
+            raise
+    return _timed_get(endpoint, url, endpoint.default_timeout, kwargs)
+
+
+def _hedged_attempt(endpoint, url, timeout, delay, kwargs):
+    if delay is None:
+        return _timed_get(endpoint, url, timeout, kwargs)
+
+    primary = _start_daemon(_timed_get, endpoint, url, timeout, kwargs)
+    done, _ = wait([primary], timeout=delay)
+    if done or not endpoint.try_spend_hedge():
+        return primary.result()
+
+    hedge = _start_daemon(_timed_get, endpoint, url, timeout, kwargs)
+    pending = {primary, hedge}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    endpoint.record_hedge_win()
+                return future.result()
+    # Both failed; surface the original request's error
+    return primary.result()
+
+
 # ---------------------------------------------------------------------------
 # Spotify helpers
 # ---------------------------------------------------------------------------
@@ -106,7 +306,7 @@ def get_auth_headers():
 def get_user_id(headers):
     """Retrieve the Spotify user ID for the current credentials."""
     try:
-        resp = requests.get(f"{BASE_URL}/me", headers=headers, timeout=10)
+        resp = hedged_get("spotify_me", f"{BASE_URL}/me", headers=headers)
         resp.raise_for_status()
         return resp.json().get("id")
     except requests.RequestException as e:
@@ -116,9 +316,9 @@ def get_user_id(headers):
 def search_track(query, headers):
     """Search Spotify for a track and return its URI."""
     try:
-        resp = requests.get(
-            f"{BASE_URL}/search", headers=headers,
-            params={"q": query, "type": "track", "limit": 1}, timeout=10,
+        resp = hedged_get(
+            "spotify_search", f"{BASE_URL}/search", headers=headers,
+            params={"q": query, "type": "track", "limit": 1},
         )
         resp.raise_for_status()
         items = resp.json().get("tracks", {}).get("items", [])
@@ -159,6 +359,261 @@ def replace_playlist(playlist_id, uris, headers):
         raise RuntimeError("Failed to replace playlist tracks") from e
 
 
+def add_to_playlist(playlist_id, uris, headers):
+    """Append the given URIs to the end of the playlist."""
+    try:
+        resp = requests.post(
+            f"{BASE_URL}/playlists/{playlist_id}/tracks",
+            headers=headers, json={"uris": uris}, timeout=10,
+        )
+        resp.raise_for_status()
+    except requests.RequestException as e:
+        raise RuntimeError("Failed to add playlist tracks") from e
+
+
+# ---------------------------------------------------------------------------
+# Show schedule: recurring windows and play classification
+# ---------------------------------------------------------------------------
+
+WEEKDAY_CODES = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+
+ShowWindow = namedtuple("ShowWindow", ["start", "end", "name"])
+
+
+def parse_rrule(rule):
+    """
+    Parse the supported subset of an RFC 5545 RRULE string into a dict.
+
+    Supported parts: FREQ (DAILY or WEEKLY), INTERVAL, BYDAY (weekday codes
+    only, e.g. "MO,WE"), COUNT and UNTIL (YYYYMMDD or YYYYMMDDTHHMMSS[Z]).
+    """
+    parts = {}
+    for item in rule.removeprefix("RRULE:").split(";"):
+        if not item:
+            continue
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Malformed RRULE part '{item}'")
+        parts[key.upper()] = value.upper()
+
+    freq = parts.pop("FREQ", None)
+    if freq not in ("DAILY", "WEEKLY"):
+        raise ValueError(f"Unsupported RRULE FREQ '{freq}' (use DAILY or WEEKLY)")
+    parsed = {"freq": freq, "interval": 1, "byday": None, "count": None, "until": None}
+
+    if "INTERVAL" in parts:
+        parsed["interval"] = int(parts.pop("INTERVAL"))
+        if parsed["interval"] < 1:
+            raise ValueError("RRULE INTERVAL must be positive")
+    if "BYDAY" in parts:
+        codes = parts.pop("BYDAY").split(",")
+        unknown = [c for c in codes if c not in WEEKDAY_CODES]
+        if unknown:
+            raise ValueError(f"Unsupported RRULE BYDAY values: {', '.join(unknown)}")
+        parsed["byday"] = sorted({WEEKDAY_CODES[c] for c in codes})
+    if "COUNT" in parts:
+        parsed["count"] = int(parts.pop("COUNT"))
+        if parsed["count"] < 1:
+            raise ValueError("RRULE COUNT must be positive")
+    if "UNTIL" in parts:
+        parsed["until"] = parts.pop("UNTIL")
+    if parts:
+        raise ValueError(f"Unsupported RRULE parts: {', '.join(sorted(parts))}")
+    return parsed
+
+
+class Recurrence:
+    """
+    One recurring show slot, e.g. "Wednesdays 7–9 PM Pacific".
+
+    dtstart is the naive local wall-clock start of the first airing and
+    duration its length. Occurrences are built in local time and converted to
+    UTC individually, so PST/PDT transitions are handled per airing.
+
+    exdates is a collection of local dates whose airing is skipped (holidays);
+    rdates is a collection of extra naive local start datetimes (specials,
+    rescheduled episodes). A reschedule is an exdate plus an rdate.
+    """
+
+    def __init__(self, name, rrule, dtstart, duration, tz=SHOW_TIMEZONE,
+                 exdates=(), rdates=()):
+        self.name = name
+        self.rule = parse_rrule(rrule)
+        self.dtstart = dtstart
+        self.duration = duration
+        self.tz = ZoneInfo(tz)
+        self.exdates = frozenset(exdates)
+        self.rdates = sorted(rdates)
+        self.until = self._parse_until(self.rule["until"])
+
+    def _parse_until(self, value):
+        if value is None:
+            return None
+        if "T" not in value:
+            day = datetime.strptime(value, "%Y%m%d")
+            local = day.replace(hour=23, minute=59, second=59, tzinfo=self.tz)
+            return local.astimezone(timezone.utc)
+        if value.endswith("Z"):
+            return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        local = datetime.strptime(value, "%Y%m%dT%H%M%S").replace(tzinfo=self.tz)
+        return local.astimezone(timezone.utc)
+
+    def _window(self, local_start):
+        start = local_start.replace(tzinfo=self.tz)
+        end = (local_start + self.duration).replace(tzinfo=self.tz)
+        return ShowWindow(start.astimezone(timezone.utc), end.astimezone(timezone.utc), self.name)
+
+    def _rule_windows(self, range_start, range_end):
+        rule = self.rule
+        first_day = self.dtstart.date()
+        if rule["freq"] == "WEEKLY":
+            anchor = first_day - timedelta(days=first_day.weekday())
+            period_days = 7 * rule["interval"]
+            offsets = rule["byday"] or [first_day.weekday()]
+        else:
+            anchor = first_day
+            period_days = rule["interval"]
+            offsets = [0]
+        # With FREQ=DAILY, BYDAY limits which days air (RFC 5545); with
+        # WEEKLY it already picked the offsets above
+        weekdays = rule["byday"] if rule["freq"] == "DAILY" else None
+
+        # Jump straight to the period containing range_start. COUNT has to be
+        # tallied from dtstart, so it always expands from the beginning.
+        period = 0
+        if rule["count"] is None:
+            earliest = (range_start - self.duration).astimezone(self.tz).date()
+            period = max(0, ((earliest - anchor).days - 1) // period_days)
+
+        emitted = 0
+        while True:
+            period_start = anchor + timedelta(days=period * period_days)
+            for offset in offsets:
+                day = period_start + timedelta(days=offset)
+                if day < first_day or (weekdays and day.weekday() not in weekdays):
+                    continue
+                window = self._window(datetime.combine(day, self.dtstart.time()))
+                if self.until is not None and window.start > self.until:
+                    return
+                if rule["count"] is not None:
+                    if emitted >= rule["count"]:
+                        return
+                    emitted += 1
+                if window.start > range_end:
+                    return
+                if day in self.exdates or window.end < range_start:
+                    continue
+                yield window
+            period += 1
+
+    def windows(self, range_start, range_end):
+        """Lazily yield ShowWindows overlapping [range_start, range_end] (UTC), in order."""
+        extra = (self._window(dt) for dt in self.rdates)
+        extra = (w for w in extra if w.end >= range_start and w.start <= range_end)
+        # A recurrence set is a set: an rdate that repeats a rule occurrence
+        # yields it once
+        previous = None
+        for window in heapq.merge(self._rule_windows(range_start, range_end), extra):
+            if window != previous:
+                yield window
+            previous = window
+
+
+class ShowSchedule:
+    """A set of Recurrences whose windows are expanded and merged on demand."""
+
+    def __init__(self, recurrences):
+        self.recurrences = list(recurrences)
+
+    def windows(self, range_start, range_end):
+        """Lazily yield ShowWindows from all recurrences, ordered by start."""
+        return heapq.merge(*(r.windows(range_start, range_end) for r in self.recurrences))
+
+    def latest_window(self, reference_time, max_lookback=timedelta(days=366 * 2)):
+        """Return the most recent ShowWindow that ended at or before reference_time."""
+        lookback = timedelta(days=8)
+        while True:
+            found = None
+            for window in self.windows(reference_time - lookback, reference_time):
+                if window.end <= reference_time:
+                    found = window
+            if found or lookback >= max_lookback:
+                return found
+            lookback *= 2
+
+    def index(self, range_start, range_end):
+        """Build an IntervalIndex over the windows in [range_start, range_end]."""
+        return IntervalIndex(self.windows(range_start, range_end))
+
+
+class IntervalIndex:
+    """
+    Sorted, non-overlapping ShowWindows supporting O(log m) timestamp lookup.
+
+    Two shows cannot air on the station at once, so overlapping windows
+    indicate a schedule mistake (e.g. a special without a matching exdate)
+    and raise ValueError.
+    """
+
+    def __init__(self, windows):
+        self.windows = sorted(windows)
+        for prev, cur in zip(self.windows, self.windows[1:]):
+            if cur.start < prev.end:
+                raise ValueError(
+                    f"Overlapping show windows: {prev.name} {prev.start.isoformat()} "
+                    f"and {cur.name} {cur.start.isoformat()}"
+                )
+        self._starts = [w.start for w in self.windows]
+
+    def __len__(self):
+        return len(self.windows)
+
+    def lookup(self, ts):
+        """Return the ShowWindow containing ts (inclusive bounds), or None."""
+        i = bisect.bisect_right(self._starts, ts) - 1
+        if i >= 0 and ts <= self.windows[i].end:
+            return self.windows[i]
+        return None
+
+
+def classify_plays(plays, schedule):
+    """
+    Label each play with the name of the show it aired in.
+
+    plays is an iterable of track dicts as returned by fetch_xmplaylist_tracks.
+    Windows are expanded once over the plays' time span and each play is then
+    a binary search, so n plays against m windows cost O(n log m).
+
+    Returns a list of show names (None for plays outside every window),
+    aligned with the input order.
+    """
+    plays = list(plays)
+    stamps = [p["timestamp"] for p in plays if p.get("timestamp")]
+    if not stamps:
+        return [None] * len(plays)
+    index = schedule.index(min(stamps), max(stamps))
+    labels = []
+    for p in plays:
+        window = index.lookup(p["timestamp"]) if p.get("timestamp") else None
+        labels.append(window.name if window else None)
+    return labels
+
+
+def default_schedule():
+    """The AD show schedule described by the SHOW_* constants."""
+    # 1900-01-01 is a Monday; offset it to the configured weekday. Expansion
+    # jumps straight to the requested range, so an early anchor costs nothing.
+    first_day = date(1900, 1, 1) + timedelta(days=SHOW_DAY_OF_WEEK)
+    return ShowSchedule([
+        Recurrence(
+            PLAYLIST_NAME, "FREQ=WEEKLY",
+            dtstart=datetime.combine(first_day, datetime.min.time()).replace(hour=SHOW_START_HOUR),
+            duration=timedelta(hours=SHOW_END_HOUR - SHOW_START_HOUR),
+            tz=SHOW_TIMEZONE,
+        ),
+    ])
+
+
 # ---------------------------------------------------------------------------
 # xmplaylist: fetch the AD show setlist
 # ---------------------------------------------------------------------------
@@ -167,36 +622,16 @@ def get_show_window(reference_time=None):
     """
     Calculate the most recent AD show window (start, end) as UTC datetimes.
 
-    The show airs Wednesdays at 7–9 PM America/Los_Angeles. This function
-    handles PST/PDT transitions automatically via zoneinfo.
+    The show airs Wednesdays at 7–9 PM America/Los_Angeles. The window comes
+    from default_schedule(), which handles PST/PDT transitions via zoneinfo.
 
     Returns (start_utc, end_utc) for the most recent show that has already ended.
     """
-    la = ZoneInfo(SHOW_TIMEZONE)
     now = reference_time or datetime.now(timezone.utc)
-    now_la = now.astimezone(la)
-
-    # Start from today in LA time and walk back to the most recent Wednesday
-    candidate_date = now_la.date()
-    days_since_wed = (candidate_date.weekday() - SHOW_DAY_OF_WEEK) % 7
-    candidate_date -= timedelta(days=days_since_wed)
-
-    # Build the show window in LA time
-    show_start_la = datetime(
-        candidate_date.year, candidate_date.month, candidate_date.day,
-        SHOW_START_HOUR, 0, 0, tzinfo=la,
-    )
-    show_end_la = datetime(
-        candidate_date.year, candidate_date.month, candidate_date.day,
-        SHOW_END_HOUR, 0, 0, tzinfo=la,
-    )
-
-    # If the show hasn't ended yet, go back one week
-    if show_end_la.astimezone(timezone.utc) > now:
-        show_start_la -= timedelta(weeks=1)
-        show_end_la -= timedelta(weeks=1)
-
-    return show_start_la.astimezone(timezone.utc), show_end_la.astimezone(timezone.utc)
+    window = default_schedule().latest_window(now)
+    if window is None:
+        raise ValueError(f"No show window ends on or before {now.isoformat()}")
+    return window.start, window.end
 
 
 def fetch_xmplaylist_tracks(start_dt, end_dt, max_pages=20):
@@ -219,9 +654,9 @@ def fetch_xmplaylist_tracks(start_dt, end_dt, max_pages=20):
             params["last"] = last_cursor
 
         try:
-            resp = requests.get(
-                XMPLAYLIST_STATION_URL,
-                headers=headers, params=params, timeout=15,
+            resp = hedged_get(
+                "xmplaylist_page", XMPLAYLIST_STATION_URL,
+                headers=headers, params=params,
             )
             resp.raise_for_status()
             data = resp.json()
@@ -272,18 +707,23 @@ def fetch_xmplaylist_tracks(start_dt, end_dt, max_pages=20):
     return collected
 
 
-def tracks_to_spotify_uris(tracks, spotify_headers):
+def tracks_to_spotify_uris(tracks, spotify_headers, checkpoint=None):
     """
     Convert xmplaylist track dicts to Spotify URIs.
 
     Uses the Spotify ID directly when available; falls back to a text search.
     Returns (uris, skipped) where skipped is a list of tracks that couldn't
     be matched.
+
+    If a RunCheckpoint is given, search results are recorded as they come in
+    and tracks it already resolved are not searched again. Permanent 4xx
+    failures are recorded like a missing match; network errors, 5xx, 401
+    and 429 are not recorded, so a rerun retries them.
     """
     uris = []
     skipped = []
 
-    for t in tracks:
+    for i, t in enumerate(tracks):
         artists_str = (
             ", ".join(t["artists"]) if isinstance(t["artists"], list) else t["artists"]
         )
@@ -295,41 +735,411 @@ def tracks_to_spotify_uris(tracks, spotify_headers):
             print(f"  ✓ {artists_str} – {t['title']} (direct ID)")
             continue
 
+        if checkpoint is not None and str(i) in checkpoint.resolutions:
+            uri = checkpoint.resolutions[str(i)]
+            if uri:
+                uris.append(uri)
+                print(f"  ~ {artists_str} – {t['title']} (search match, checkpointed)")
+            else:
+                print(f"  ✗ {artists_str} – {t['title']} — skipped (checkpointed)")
+                skipped.append(t)
+            continue
+
         # Fallback: search by artist + title
         query = f"{artists_str} {t['title']}"
         try:
             uri = search_track(query, spotify_headers)
             uris.append(uri)
             print(f"  ~ {artists_str} – {t['title']} (search match)")
-        except (ValueError, RuntimeError) as e:
+        except ValueError as e:
+            print(f"  ✗ {artists_str} – {t['title']} — skipped: {e}")
+            skipped.append(t)
+            uri = None
+        except RuntimeError as e:
             print(f"  ✗ {artists_str} – {t['title']} — skipped: {e}")
             skipped.append(t)
+            if not _is_permanent_failure(e):
+                continue
+            uri = None
+
+        if checkpoint is not None:
+            checkpoint.resolutions[str(i)] = uri
+            checkpoint.save()
 
     return uris, skipped
 
 
+def _is_permanent_failure(error):
+    """
+    True if a wrapped requests error is a 4xx that retrying won't fix.
+
+    401 (expired token) and 429 (rate limited) are worth retrying, as are
+    network errors and 5xx responses.
+    """
+    response = getattr(error.__cause__, "response", None)
+    if response is None:
+        return False
+    return 400 <= response.status_code < 500 and response.status_code not in (401, 429)
+
+
+# ---------------------------------------------------------------------------
+# Run checkpoints
+# ---------------------------------------------------------------------------
+
+class RunCheckpoint:
+    """
+    Progress of one update run, keyed by show window and kept in a JSON file.
+
+    Records the fetched plays, search resolutions (track index -> URI, or None
+    when Spotify has no match), the final URI list and the playlist ID. Every
+    save rewrites the file atomically, so a crash never leaves a half-written
+    state behind.
+    """
+
+    def __init__(self, path, start, end):
+        self.path = path
+        self.key = start.isoformat()
+        self.start = start
+        self.end = end
+        self.tracks = None
+        self.resolutions = {}
+        self.uris = None
+        self.playlist_id = None
+        self.completed = False
+
+    @classmethod
+    def load(cls, path, start, end):
+        """Return the checkpoint for (start, end), or a fresh one if none exists."""
+        checkpoint = cls(path, start, end)
+        run = _read_state(path).get("runs", {}).get(checkpoint.key)
+        if run and run.get("end") == end.isoformat():
+            if run.get("tracks") is not None:
+                checkpoint.tracks = [_track_from_json(t) for t in run["tracks"]]
+            checkpoint.resolutions = run.get("resolutions", {})
+            checkpoint.uris = run.get("uris")
+            checkpoint.playlist_id = run.get("playlist_id")
+            checkpoint.completed = run.get("completed", False)
+        return checkpoint
+
+    def save(self):
+        state = _read_state(self.path)
+        runs = state.setdefault("runs", {})
+        runs[self.key] = {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "tracks": (
+                None if self.tracks is None else [_track_to_json(t) for t in self.tracks]
+            ),
+            "resolutions": self.resolutions,
+            "uris": self.uris,
+            "playlist_id": self.playlist_id,
+            "completed": self.completed,
+        }
+        # ISO timestamps in UTC sort chronologically; drop the oldest windows
+        for key in sorted(runs)[:-CHECKPOINT_KEEP]:
+            del runs[key]
+        _write_state_atomic(self.path, state)
+
+
+def last_run_summary(path):
+    """Summarize the most recent checkpointed run in the state file, or None."""
+    runs = _read_state(path).get("runs", {})
+    if not runs:
+        return None
+    run = runs[max(runs)]
+    return {
+        "start": run.get("start"),
+        "end": run.get("end"),
+        "playlist_id": run.get("playlist_id"),
+        "tracks": None if run.get("tracks") is None else len(run["tracks"]),
+        "uris": None if run.get("uris") is None else len(run["uris"]),
+        "completed": run.get("completed", False),
+    }
+
+
+def _read_state(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Warning: ignoring unreadable state file {path}: {e}")
+        return {}
+
+
+def _write_state_atomic(path, state):
+    """Write state to a temp file in the same directory, then rename over path."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".ad_radio_state.", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _track_to_json(t):
+    return {
+        "title": t["title"],
+        "artists": t["artists"],
+        "spotify_id": t.get("spotify_id"),
+        "timestamp": t["timestamp"].isoformat() if t.get("timestamp") else None,
+    }
+
+
+def _track_from_json(t):
+    ts = t.get("timestamp")
+    return {
+        "title": t["title"],
+        "artists": t["artists"],
+        "spotify_id": t.get("spotify_id"),
+        "timestamp": datetime.fromisoformat(ts) if ts else None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Local HTTP service: serve setlists to other tools
+# ---------------------------------------------------------------------------
+
+class SetlistCache:
+    """
+    Bounded LRU of setlists keyed by show window, with time-based invalidation.
+
+    Concurrent lookups for the same window share one upstream fetch: the first
+    caller fetches, later callers wait on its result instead of re-paging
+    xmplaylist themselves.
+    """
+
+    def __init__(self, fetch=None, maxsize=SERVE_CACHE_SIZE, ttl=SERVE_CACHE_TTL,
+                 clock=time.monotonic):
+        self._fetch = fetch or fetch_xmplaylist_tracks
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # (start, end) -> (fetched_at, tracks)
+        self._inflight = {}             # (start, end) -> _InflightFetch
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+
+    def get(self, start, end):
+        """Return the tracks for (start, end), fetching upstream at most once."""
+        key = (start, end)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and self._clock() - cached[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._inflight[key] = _InflightFetch()
+
+        if not owner:
+            return pending.wait()
+
+        try:
+            tracks = self._fetch(start, end)
+        except Exception as e:
+            with self._lock:
+                del self._inflight[key]
+            pending.fail(e)
+            raise
+
+        with self._lock:
+            self.fetches += 1
+            self._entries[key] = (self._clock(), tracks)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            del self._inflight[key]
+        pending.resolve(tracks)
+        return tracks
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "fetches": self.fetches,
+                "in_flight": len(self._inflight),
+            }
+
+
+class _InflightFetch:
+    """Result slot shared by callers waiting on the same upstream fetch."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+
+    def resolve(self, result):
+        self._result = result
+        self._done.set()
+
+    def fail(self, error):
+        self._error = error
+        self._done.set()
+
+    def wait(self):
+        self._done.wait()
+        if self._error is not None:
+            raise RuntimeError(str(self._error)) from self._error
+        return self._result
+
+
+def show_window_for_week(week):
+    """
+    Return the show window (start_utc, end_utc) for a YYYY-MM-DD date string.
+
+    The date is read in the show's local timezone; the result is the most
+    recent show that ended on or before the end of that day, so passing the
+    show's own air date returns that episode.
+    """
+    try:
+        day = date.fromisoformat(week)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid week '{week}', expected YYYY-MM-DD") from e
+    la = ZoneInfo(SHOW_TIMEZONE)
+    end_of_day = datetime(day.year, day.month, day.day, tzinfo=la) + timedelta(days=1)
+    return get_show_window(end_of_day.astimezone(timezone.utc))
+
+
+def make_setlist_handler(cache, state_path=CHECKPOINT_PATH):
+    """
+    Build a request handler class bound to the given SetlistCache.
+
+    /status reports the playlist and last update run from the checkpoint file
+    at state_path, as written by update_playlist.
+    """
+    started_at = datetime.now(timezone.utc)
+
+    class SetlistHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path == "/setlist":
+                self._setlist(query.get("week", [None])[0])
+            elif url.path == "/status":
+                self._status()
+            else:
+                self._send(404, {"error": f"Unknown path '{url.path}'"})
+
+        def _setlist(self, week):
+            try:
+                start, end = show_window_for_week(week) if week else get_show_window()
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+                return
+            if end > datetime.now(timezone.utc):
+                self._send(404, {"error": f"The show for week '{week}' has not aired yet"})
+                return
+            try:
+                tracks = cache.get(start, end)
+            except Exception as e:
+                self._send(502, {"error": f"Upstream fetch failed: {e}"})
+                return
+            self._send(200, {
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "count": len(tracks),
+                "tracks": [_track_to_json(t) for t in tracks],
+            })
+
+        def _status(self):
+            start, end = get_show_window()
+            self._send(200, {
+                "started_at": started_at.isoformat(),
+                "current_window": {"start": start.isoformat(), "end": end.isoformat()},
+                "playlist_id": PLAYLIST_ID,
+                "last_run": last_run_summary(state_path) if state_path else None,
+                "cache": cache.stats(),
+                "latency": {name: e.stats() for name, e in ENDPOINT_LATENCY.items()},
+            })
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return SetlistHandler
+
+
+def serve(host=SERVE_HOST, port=SERVE_PORT, cache_size=SERVE_CACHE_SIZE,
+          cache_ttl=SERVE_CACHE_TTL, state_path=CHECKPOINT_PATH):
+    """Run the local setlist HTTP API until interrupted."""
+    cache = SetlistCache(maxsize=cache_size, ttl=cache_ttl)
+    server = ThreadingHTTPServer((host, port), make_setlist_handler(cache, state_path))
+    print(f"Serving setlists on http://{host}:{server.server_port} (/setlist, /status)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
-def update_playlist(dry_run=False):
+def update_playlist(dry_run=False, state_path=CHECKPOINT_PATH, fresh=False):
     """Main flow: fetch setlist from xmplaylist, resolve Spotify URIs, update playlist.
 
     If dry_run is True, fetches and prints the setlist but does not touch Spotify.
     No Spotify credentials are needed for dry-run mode.
+
+    Progress is checkpointed to state_path (see RunCheckpoint), so rerunning
+    after a failure resumes at the first incomplete step. fresh=True ignores
+    any stored progress for the window and starts over. Dry runs, or a falsy
+    state_path, skip checkpointing entirely.
     """
     # 1. Determine the show window
     start, end = get_show_window()
     print(f"Show window: {start.isoformat()} → {end.isoformat()}")
 
+    checkpoint = None
+    if state_path and not dry_run:
+        checkpoint = RunCheckpoint.load(state_path, start, end)
+        moved = checkpoint.completed and PLAYLIST_ID and checkpoint.playlist_id != PLAYLIST_ID
+        if moved:
+            print(f"Checkpoint is for playlist {checkpoint.playlist_id}; starting over.")
+        if fresh or moved:
+            checkpoint = RunCheckpoint(state_path, start, end)
+        elif checkpoint.completed:
+            print(f"Playlist {checkpoint.playlist_id} already updated for this show window.")
+            return checkpoint.playlist_id, len(checkpoint.uris)
+
     # 2. Fetch tracks from xmplaylist
-    tracks = fetch_xmplaylist_tracks(start, end)
-    if not tracks:
-        raise RuntimeError(
-            "No tracks found for the show window. The show may not have aired, "
-            "or xmplaylist data may have expired. Try running sooner after the show."
-        )
-    print(f"Found {len(tracks)} tracks from xmplaylist\n")
+    if checkpoint is not None and checkpoint.tracks:
+        tracks = checkpoint.tracks
+        print(f"Resuming from checkpoint: {len(tracks)} tracks already fetched\n")
+    else:
+        tracks = fetch_xmplaylist_tracks(start, end)
+        if not tracks:
+            raise RuntimeError(
+                "No tracks found for the show window. The show may not have aired, "
+                "or xmplaylist data may have expired. Try running sooner after the show."
+            )
+        print(f"Found {len(tracks)} tracks from xmplaylist\n")
+        if checkpoint is not None:
+            checkpoint.tracks = tracks
+            checkpoint.save()
 
     for i, t in enumerate(tracks, 1):
         artists_str = (
@@ -347,30 +1157,67 @@ def update_playlist(dry_run=False):
     # 3. Resolve Spotify URIs (requires creds)
     _require_spotify_env()
     spotify_headers = get_auth_headers()
-    uris, skipped = tracks_to_spotify_uris(tracks, spotify_headers)
-
-    if not uris:
-        raise RuntimeError("No Spotify URIs resolved — nothing to add to the playlist.")
-
-    print(f"\n{len(uris)} matched, {len(skipped)} skipped")
+    pending = []
+    if checkpoint is not None and checkpoint.uris is not None:
+        uris = checkpoint.uris
+        print(f"Resuming from checkpoint: {len(uris)} URIs already resolved")
+    else:
+        uris, skipped = tracks_to_spotify_uris(tracks, spotify_headers, checkpoint)
+
+        if not uris:
+            raise RuntimeError("No Spotify URIs resolved — nothing to add to the playlist.")
+
+        print(f"\n{len(uris)} matched, {len(skipped)} skipped")
+        if checkpoint is not None:
+            # Searches that failed transiently aren't in resolutions; leave the
+            # URI list unset so a rerun retries them instead of reusing this one
+            pending = [
+                t for i, t in enumerate(tracks)
+                if not t.get("spotify_id") and str(i) not in checkpoint.resolutions
+            ]
+            if not pending:
+                checkpoint.uris = uris
+                checkpoint.save()
 
     # 4. Update (or create) the playlist
-    user_id = get_user_id(spotify_headers)
-    pid = PLAYLIST_ID
+    pid = PLAYLIST_ID or (checkpoint.playlist_id if checkpoint is not None else None)
     if not pid:
         print("Creating new playlist...")
+        user_id = get_user_id(spotify_headers)
         pid = create_new_playlist(user_id, spotify_headers)
         if dotenv_path:
             set_key(dotenv_path, "PLAYLIST_ID", pid)
         print(f"Saved new PLAYLIST_ID: {pid}")
-
+    if checkpoint is not None and checkpoint.playlist_id != pid:
+        checkpoint.playlist_id = pid
+        checkpoint.save()
+
+    # The first batch replaces the playlist contents; the rest are appended.
+    # An append may have landed even if its response was lost, so writes always
+    # start over from the replace rather than resuming after the last batch.
+    batches = [
+        uris[i:i + PLAYLIST_BATCH_SIZE] for i in range(0, len(uris), PLAYLIST_BATCH_SIZE)
+    ]
     print(f"Updating playlist {pid} with {len(uris)} tracks...")
-    replace_playlist(pid, uris, spotify_headers)
+    for n, batch in enumerate(batches):
+        if n == 0:
+            replace_playlist(pid, batch, spotify_headers)
+        else:
+            add_to_playlist(pid, batch, spotify_headers)
+
+    if pending:
+        # Fail the run so CI's "Re-run failed jobs" retries the same window
+        raise RuntimeError(
+            f"Playlist updated, but {len(pending)} searches failed; rerun to retry them."
+        )
+    if checkpoint is not None:
+        checkpoint.completed = True
+        checkpoint.save()
     print("Playlist update complete.")
     return pid, len(uris)
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Fetch the AD Radio show setlist and update a Spotify playlist."
     )
@@ -380,10 +1227,47 @@ def main():
         help="Fetch and display the setlist from xmplaylist without touching Spotify. "
              "No Spotify credentials required.",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--state-file",
+        default=CHECKPOINT_PATH,
+        help="Checkpoint file used to resume a failed run (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Ignore any checkpointed progress for this show window and start over.",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run a local HTTP API serving setlists (/setlist?week=YYYY-MM-DD, /status).",
+    )
+    serve_parser.add_argument("--host", default=SERVE_HOST)
+    serve_parser.add_argument("--port", type=int, default=SERVE_PORT)
+    serve_parser.add_argument(
+        "--cache-size", type=int, default=SERVE_CACHE_SIZE,
+        help="Maximum number of show windows kept in memory.",
+    )
+    serve_parser.add_argument(
+        "--cache-ttl", type=int, default=SERVE_CACHE_TTL,
+        help="Seconds before a cached setlist is re-fetched from xmplaylist.",
+    )
+    # Also accepted after `serve`; SUPPRESS keeps the top-level value otherwise
+    serve_parser.add_argument(
+        "--state-file",
+        default=argparse.SUPPRESS,
+        help=f"Checkpoint file whose last run /status reports (default: {CHECKPOINT_PATH}).",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        if args.dry_run:
+            parser.error("--dry-run cannot be combined with serve")
+        serve(args.host, args.port, args.cache_size, args.cache_ttl, args.state_file)
+        return
 
     try:
-        update_playlist(dry_run=args.dry_run)
+        update_playlist(dry_run=args.dry_run, state_path=args.state_file, fresh=args.fresh)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
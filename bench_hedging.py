@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark hedged GETs against plain fixed-timeout GETs.
+
+Starts a local fake HTTP server that usually answers in a few milliseconds
+but injects occasional latency spikes, then issues the same sequential
+workload twice: once with requests.get and a fixed timeout (the old
+behaviour), once through hedged_get. Prints latency percentiles for both.
+
+    python bench_hedging.py --requests 500 --spike-rate 0.05 --spike-ms 1000
+"""
+
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import ad_radio_playlist as arp
+
+
+def make_handler(base_ms, spike_ms, spike_rate, seed):
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    class SpikyHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                spike = rng.random() < spike_rate
+            time.sleep((spike_ms if spike else base_ms) / 1000)
+            body = b'{"results": []}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return SpikyHandler
+
+
+def run(label, get, n):
+    latencies = []
+    for _ in range(n):
+        started = time.monotonic()
+        get().raise_for_status()
+        latencies.append(time.monotonic() - started)
+    latencies.sort()
+
+    def pct(q):
+        return latencies[min(n - 1, int(q / 100 * n))] * 1000
+
+    print(
+        f"{label:>8}: p50 {pct(50):7.1f} ms  p95 {pct(95):7.1f} ms  "
+        f"p99 {pct(99):7.1f} ms  max {latencies[-1] * 1000:7.1f} ms  "
+        f"total {sum(latencies):6.2f} s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--base-ms", type=float, default=20)
+    parser.add_argument("--spike-ms", type=float, default=1000)
+    parser.add_argument("--spike-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=35)
+    args = parser.parse_args()
+
+    results = {}
+    for label in ("fixed", "hedged"):
+        # Same seed for both runs, so each sees the same spike sequence
+        handler = make_handler(args.base_ms, args.spike_ms, args.spike_rate, args.seed)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/"
+        try:
+            if label == "fixed":
+                run(label, lambda: requests.get(url, timeout=15), args.requests)
+            else:
+                endpoint = arp.ENDPOINT_LATENCY["xmplaylist_page"]
+                endpoint.reset()
+                run(label, lambda: arp.hedged_get("xmplaylist_page", url), args.requests)
+                results = endpoint.stats()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print(
+        f"\nhedged: {results['hedges']} hedges for {results['requests']} requests "
+        f"({results['hedge_wins']} won), adaptive timeout {results['timeout']:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
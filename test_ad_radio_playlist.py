@@ -1,5 +1,8 @@
 import json
-from datetime import datetime, timedelta, timezone
+import threading
+import urllib.error
+import urllib.request
+from datetime import date, datetime, timedelta, timezone
 
 import pytest
 
@@ -20,6 +23,13 @@ class DummyResponse:
             raise arp.requests.HTTPError(f"HTTP {self.status_code}")
 
 
+@pytest.fixture(autouse=True)
+def _reset_endpoint_latency():
+    """Latency samples are module state; keep them from leaking across tests."""
+    for endpoint in arp.ENDPOINT_LATENCY.values():
+        endpoint.reset()
+
+
 # ---------------------------------------------------------------------------
 # Spotify helpers
 # ---------------------------------------------------------------------------
@@ -97,6 +107,15 @@ def test_get_show_window_during_show():
     assert end == datetime(2025, 3, 13, 4, 0, tzinfo=timezone.utc)
 
 
+def test_get_show_window_before_2001():
+    """The default schedule covers historical dates, not just recent ones."""
+    # Thu Jan 16 1997 10:00 UTC; Wed Jan 15 7–9 PM PST = Thu 03:00–05:00 UTC
+    ref = datetime(1997, 1, 16, 10, 0, tzinfo=timezone.utc)
+    start, end = arp.get_show_window(ref)
+    assert start == datetime(1997, 1, 16, 3, 0, tzinfo=timezone.utc)
+    assert end == datetime(1997, 1, 16, 5, 0, tzinfo=timezone.utc)
+
+
 # ---------------------------------------------------------------------------
 # xmplaylist fetch
 # ---------------------------------------------------------------------------
@@ -211,3 +230,532 @@ def test_tracks_to_spotify_uris_search_fails(monkeypatch):
     uris, skipped = arp.tracks_to_spotify_uris(tracks, {"Authorization": "Bearer x"})
     assert uris == []
     assert len(skipped) == 1
+
+
+# ---------------------------------------------------------------------------
+# Local HTTP service
+# ---------------------------------------------------------------------------
+
+def test_show_window_for_week_air_date():
+    """Passing the show's air date returns that episode."""
+    start, end = arp.show_window_for_week("2025-03-19")
+    assert start == datetime(2025, 3, 20, 2, 0, tzinfo=timezone.utc)
+    assert end == datetime(2025, 3, 20, 4, 0, tzinfo=timezone.utc)
+
+
+def test_show_window_for_week_invalid():
+    with pytest.raises(ValueError):
+        arp.show_window_for_week("last week")
+
+
+def test_setlist_cache_ttl_and_lru():
+    now = [0.0]
+    calls = []
+
+    def fake_fetch(start, end):
+        calls.append(start)
+        return [start]
+
+    cache = arp.SetlistCache(fetch=fake_fetch, maxsize=2, ttl=60, clock=lambda: now[0])
+    assert cache.get(1, 2) == [1]
+    assert cache.get(1, 2) == [1]
+    assert calls == [1]
+
+    # Expired entries are re-fetched
+    now[0] = 61
+    cache.get(1, 2)
+    assert calls == [1, 1]
+
+    # Least recently used window is evicted
+    cache.get(3, 4)
+    cache.get(1, 2)
+    cache.get(5, 6)
+    cache.get(1, 2)
+    cache.get(3, 4)
+    assert calls == [1, 1, 3, 5, 3]
+
+
+def test_setlist_cache_coalesces_concurrent_fetches():
+
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch(start, end):
+        calls.append(start)
+        started.set()
+        release.wait(5)
+        return ["track"]
+
+    cache = arp.SetlistCache(fetch=slow_fetch)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get(1, 2)))
+        for _ in range(5)
+    ]
+    for th in threads:
+        th.start()
+    started.wait(5)
+    release.set()
+    for th in threads:
+        th.join()
+
+    assert calls == [1]
+    assert results == [["track"]] * 5
+
+
+def test_serve_setlist_endpoint(tmp_path, monkeypatch):
+    start = datetime(2025, 3, 20, 2, 0, tzinfo=timezone.utc)
+    track = {"title": "Song", "artists": ["Artist"], "spotify_id": "sp1",
+             "timestamp": start + timedelta(minutes=5)}
+
+    def fake_fetch(s, e):
+        if s != start:
+            raise ConnectionError("upstream down")
+        return [track]
+
+    state_path = str(tmp_path / "state.json")
+    checkpoint = arp.RunCheckpoint(state_path, start, start + timedelta(hours=2))
+    checkpoint.tracks = [track]
+    checkpoint.uris = ["spotify:track:sp1"]
+    checkpoint.playlist_id = "pl1"
+    checkpoint.completed = True
+    checkpoint.save()
+    monkeypatch.setattr(arp, "PLAYLIST_ID", "pl1")
+
+    cache = arp.SetlistCache(fetch=fake_fetch)
+    handler = arp.make_setlist_handler(cache, state_path)
+    server = arp.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    def get_error(path):
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(f"{base}{path}")
+        return excinfo.value.code
+
+    try:
+        with urllib.request.urlopen(f"{base}/setlist?week=2025-03-19") as resp:
+            body = json.loads(resp.read())
+        assert body["start"] == start.isoformat()
+        assert body["tracks"][0]["title"] == "Song"
+        assert body["tracks"][0]["timestamp"] == "2025-03-20T02:05:00+00:00"
+
+        assert get_error("/setlist?week=2025-03-12") == 502
+        assert get_error("/setlist?week=2999-01-06") == 404
+        assert get_error("/setlist?week=soon") == 400
+
+        with urllib.request.urlopen(f"{base}/status") as resp:
+            status = json.loads(resp.read())
+        assert status["cache"]["fetches"] == 1
+        assert status["playlist_id"] == "pl1"
+        assert status["last_run"]["completed"] is True
+        assert status["last_run"]["uris"] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_main_serve_accepts_state_file(monkeypatch):
+    served = []
+    monkeypatch.setattr(arp, "serve", lambda *args: served.append(args))
+
+    arp.main(["serve", "--state-file", "x.json", "--port", "9000"])
+    arp.main(["--state-file", "y.json", "serve"])
+    assert served[0][1] == 9000 and served[0][4] == "x.json"
+    assert served[1][4] == "y.json"
+
+    with pytest.raises(SystemExit):
+        arp.main(["--dry-run", "serve"])
+
+
+# ---------------------------------------------------------------------------
+# Show schedule
+# ---------------------------------------------------------------------------
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_parse_rrule_rejects_unsupported():
+    with pytest.raises(ValueError):
+        arp.parse_rrule("FREQ=MONTHLY")
+    with pytest.raises(ValueError):
+        arp.parse_rrule("FREQ=WEEKLY;BYSETPOS=1")
+    with pytest.raises(ValueError):
+        arp.parse_rrule("FREQ=WEEKLY;COUNT=0")
+
+
+def test_recurrence_twice_weekly_across_dst():
+    """Mon + Wed at 7 PM Pacific; DST starts Sun Mar 9 2025."""
+    rec = arp.Recurrence(
+        "Show", "FREQ=WEEKLY;BYDAY=MO,WE",
+        dtstart=datetime(2025, 1, 6, 19, 0), duration=timedelta(hours=2),
+    )
+    windows = list(rec.windows(_utc(2025, 3, 5), _utc(2025, 3, 14)))
+    assert [w.start for w in windows] == [
+        _utc(2025, 3, 6, 3, 0),    # Wed Mar 5, PST
+        _utc(2025, 3, 11, 2, 0),   # Mon Mar 10, PDT
+        _utc(2025, 3, 13, 2, 0),   # Wed Mar 12, PDT
+    ]
+
+
+def test_recurrence_reschedule_and_until():
+    """A holiday reschedule is an exdate plus an rdate; UNTIL ends the run."""
+    rec = arp.Recurrence(
+        "Show", "FREQ=WEEKLY;UNTIL=20250108",
+        dtstart=datetime(2024, 12, 4, 19, 0), duration=timedelta(hours=2),
+        exdates=[date(2024, 12, 25)], rdates=[datetime(2024, 12, 26, 19, 0)],
+    )
+    windows = list(rec.windows(_utc(2024, 12, 1), _utc(2025, 2, 1)))
+    assert [w.start.date() for w in windows] == [
+        date(2024, 12, 5), date(2024, 12, 12), date(2024, 12, 19),
+        date(2024, 12, 27), date(2025, 1, 2), date(2025, 1, 9),
+    ]
+
+
+def test_recurrence_daily_byday_limits_days():
+    """FREQ=DAILY;BYDAY=MO,WE airs only on Mondays and Wednesdays."""
+    rec = arp.Recurrence(
+        "Show", "FREQ=DAILY;BYDAY=MO,WE;COUNT=3",
+        dtstart=datetime(2025, 3, 3, 19, 0), duration=timedelta(hours=2),
+    )
+    windows = list(rec.windows(_utc(2025, 3, 1), _utc(2025, 4, 1)))
+    assert [w.start.date() for w in windows] == [
+        date(2025, 3, 4), date(2025, 3, 6), date(2025, 3, 11),
+    ]
+
+
+def test_recurrence_rdate_on_rule_occurrence_is_deduplicated():
+    rec = arp.Recurrence(
+        "Show", "FREQ=WEEKLY",
+        dtstart=datetime(2025, 3, 5, 19, 0), duration=timedelta(hours=2),
+        rdates=[datetime(2025, 3, 12, 19, 0)],
+    )
+    windows = list(rec.windows(_utc(2025, 3, 1), _utc(2025, 3, 14)))
+    assert [w.start.date() for w in windows] == [date(2025, 3, 6), date(2025, 3, 13)]
+    assert len(arp.IntervalIndex(windows)) == 2
+
+
+def test_recurrence_count_ignores_range_start():
+    rec = arp.Recurrence(
+        "Show", "FREQ=DAILY;INTERVAL=2;COUNT=3",
+        dtstart=datetime(2025, 1, 1, 12, 0), duration=timedelta(hours=1),
+    )
+    assert list(rec.windows(_utc(2025, 1, 4), _utc(2025, 2, 1))) == [
+        arp.ShowWindow(_utc(2025, 1, 5, 20, 0), _utc(2025, 1, 5, 21, 0), "Show"),
+    ]
+
+
+def test_interval_index_rejects_overlap():
+    a = arp.ShowWindow(_utc(2025, 1, 1, 2), _utc(2025, 1, 1, 4), "A")
+    b = arp.ShowWindow(_utc(2025, 1, 1, 3), _utc(2025, 1, 1, 5), "B")
+    with pytest.raises(ValueError):
+        arp.IntervalIndex([a, b])
+
+
+def test_classify_plays():
+    schedule = arp.ShowSchedule([
+        arp.default_schedule().recurrences[0],
+        arp.Recurrence(
+            "Special", "FREQ=WEEKLY;BYDAY=FR;COUNT=1",
+            dtstart=datetime(2025, 3, 21, 12, 0), duration=timedelta(hours=1),
+        ),
+    ])
+    plays = [
+        {"title": "a", "timestamp": _utc(2025, 3, 20, 3, 0)},    # Wed show
+        {"title": "b", "timestamp": _utc(2025, 3, 20, 12, 0)},   # between shows
+        {"title": "c", "timestamp": _utc(2025, 3, 21, 19, 30)},  # Fri special
+        {"title": "d", "timestamp": None},
+    ]
+    assert arp.classify_plays(plays, schedule) == [
+        arp.PLAYLIST_NAME, None, "Special", None,
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Run checkpoints
+# ---------------------------------------------------------------------------
+
+def test_run_checkpoint_round_trip_and_prune(tmp_path, monkeypatch):
+    monkeypatch.setattr(arp, "CHECKPOINT_KEEP", 2)
+    path = str(tmp_path / "state.json")
+    start = _utc(2025, 3, 20, 2)
+    track = {"title": "Song", "artists": ["A"], "spotify_id": None,
+             "timestamp": start + timedelta(minutes=1)}
+
+    cp = arp.RunCheckpoint.load(path, start, start + timedelta(hours=2))
+    cp.tracks = [track]
+    cp.resolutions["0"] = "spotify:track:x"
+    cp.save()
+
+    loaded = arp.RunCheckpoint.load(path, start, start + timedelta(hours=2))
+    assert loaded.tracks == [track]
+    assert loaded.resolutions == {"0": "spotify:track:x"}
+
+    for weeks in (1, 2):
+        later = start + timedelta(weeks=weeks)
+        arp.RunCheckpoint.load(path, later, later + timedelta(hours=2)).save()
+    assert arp.RunCheckpoint.load(path, start, start + timedelta(hours=2)).tracks is None
+    assert list(tmp_path.iterdir()) == [tmp_path / "state.json"]
+
+
+def test_update_playlist_resumes_after_failure(tmp_path, monkeypatch):
+    """A failed batch write reruns without re-fetching or re-searching."""
+    start, end = _utc(2025, 3, 20, 2), _utc(2025, 3, 20, 4)
+    tracks = [
+        {"title": f"Song {i}", "artists": ["A"], "spotify_id": None if i == 0 else f"id{i}",
+         "timestamp": start + timedelta(minutes=i)}
+        for i in range(5)
+    ]
+    calls = {"fetch": 0, "search": 0, "replace": [], "add": []}
+    fail_add = [True]
+
+    def fake_fetch(s, e):
+        calls["fetch"] += 1
+        return tracks
+
+    def fake_search(query, headers):
+        calls["search"] += 1
+        return "spotify:track:found"
+
+    def fake_add(pid, uris, headers):
+        if fail_add[0]:
+            raise RuntimeError("Failed to add playlist tracks")
+        calls["add"].append(uris)
+
+    monkeypatch.setattr(arp, "get_show_window", lambda: (start, end))
+    monkeypatch.setattr(arp, "fetch_xmplaylist_tracks", fake_fetch)
+    monkeypatch.setattr(arp, "search_track", fake_search)
+    monkeypatch.setattr(arp, "replace_playlist", lambda pid, uris, h: calls["replace"].append(uris))
+    monkeypatch.setattr(arp, "add_to_playlist", fake_add)
+    monkeypatch.setattr(arp, "_require_spotify_env", lambda: None)
+    monkeypatch.setattr(arp, "get_auth_headers", lambda: {})
+    monkeypatch.setattr(arp, "PLAYLIST_ID", "pl1")
+    monkeypatch.setattr(arp, "PLAYLIST_BATCH_SIZE", 2)
+    path = str(tmp_path / "state.json")
+
+    with pytest.raises(RuntimeError):
+        arp.update_playlist(state_path=path)
+    assert calls["replace"] == [["spotify:track:found", "spotify:track:id1"]]
+
+    fail_add[0] = False
+    assert arp.update_playlist(state_path=path) == ("pl1", 5)
+    assert calls["fetch"] == 1
+    assert calls["search"] == 1
+    # Writes restart at the replace so a lost append can't be duplicated
+    assert len(calls["replace"]) == 2
+    assert calls["add"] == [["spotify:track:id2", "spotify:track:id3"], ["spotify:track:id4"]]
+
+    # A completed window is a no-op
+    assert arp.update_playlist(state_path=path) == ("pl1", 5)
+    assert calls["fetch"] == 1 and len(calls["add"]) == 2
+
+
+def test_update_playlist_retries_transient_search_failures(tmp_path, monkeypatch):
+    """A search that failed with a 5xx is searched again on the rerun."""
+    start, end = _utc(2025, 3, 20, 2), _utc(2025, 3, 20, 4)
+    tracks = [
+        {"title": "Song 0", "artists": ["A"], "spotify_id": None, "timestamp": start},
+        {"title": "Song 1", "artists": ["A"], "spotify_id": "id1",
+         "timestamp": start + timedelta(minutes=1)},
+    ]
+    searches = []
+    fail = [True]
+
+    def fake_search(query, headers):
+        searches.append(query)
+        if fail[0]:
+            raise RuntimeError(f"Search request failed for '{query}'")
+        return "spotify:track:found"
+
+    def fake_replace(pid, uris, headers):
+        if fail[0]:
+            raise RuntimeError("Failed to replace playlist tracks")
+
+    monkeypatch.setattr(arp, "get_show_window", lambda: (start, end))
+    monkeypatch.setattr(arp, "fetch_xmplaylist_tracks", lambda s, e: tracks)
+    monkeypatch.setattr(arp, "search_track", fake_search)
+    monkeypatch.setattr(arp, "replace_playlist", fake_replace)
+    monkeypatch.setattr(arp, "_require_spotify_env", lambda: None)
+    monkeypatch.setattr(arp, "get_auth_headers", lambda: {})
+    monkeypatch.setattr(arp, "PLAYLIST_ID", "pl")
+    path = str(tmp_path / "state.json")
+
+    with pytest.raises(RuntimeError):
+        arp.update_playlist(state_path=path)
+
+    fail[0] = False
+    assert arp.update_playlist(state_path=path) == ("pl", 2)
+    assert len(searches) == 2
+
+
+def _stub_spotify_run(monkeypatch, start, tracks, search, replace=None):
+    monkeypatch.setattr(arp, "get_show_window", lambda: (start, start + timedelta(hours=2)))
+    monkeypatch.setattr(arp, "fetch_xmplaylist_tracks", lambda s, e: tracks)
+    monkeypatch.setattr(arp, "search_track", search)
+    monkeypatch.setattr(arp, "replace_playlist", replace or (lambda pid, uris, h: None))
+    monkeypatch.setattr(arp, "_require_spotify_env", lambda: None)
+    monkeypatch.setattr(arp, "get_auth_headers", lambda: {})
+    monkeypatch.setattr(arp, "PLAYLIST_ID", "pl")
+
+
+def test_update_playlist_records_permanent_search_failures(tmp_path, monkeypatch):
+    """A 400 from search is final: the run completes and reruns are no-ops."""
+    start = _utc(2025, 3, 20, 2)
+    tracks = [{"title": "Bad", "artists": ["A"], "spotify_id": None, "timestamp": start},
+              {"title": "Ok", "artists": ["A"], "spotify_id": "id1", "timestamp": start}]
+    searches, replaces = [], []
+
+    def fake_search(query, headers):
+        searches.append(query)
+        error = arp.requests.HTTPError("HTTP 400", response=DummyResponse(status_code=400))
+        raise RuntimeError(f"Search request failed for '{query}'") from error
+
+    _stub_spotify_run(monkeypatch, start, tracks, fake_search,
+                      lambda pid, uris, h: replaces.append(uris))
+    path = str(tmp_path / "state.json")
+    for _ in range(3):
+        assert arp.update_playlist(state_path=path) == ("pl", 1)
+    assert len(searches) == 1
+    assert replaces == [["spotify:track:id1"]]
+
+
+def test_update_playlist_fresh_and_changed_playlist_ignore_checkpoint(tmp_path, monkeypatch):
+    start = _utc(2025, 3, 20, 2)
+    tracks = [{"title": "Ok", "artists": ["A"], "spotify_id": "id1", "timestamp": start}]
+    replaces = []
+    _stub_spotify_run(monkeypatch, start, tracks, None,
+                      lambda pid, uris, h: replaces.append(pid))
+    path = str(tmp_path / "state.json")
+
+    arp.update_playlist(state_path=path)
+    arp.update_playlist(state_path=path)
+    assert replaces == ["pl"]
+
+    arp.update_playlist(state_path=path, fresh=True)
+    assert replaces == ["pl", "pl"]
+
+    monkeypatch.setattr(arp, "PLAYLIST_ID", "pl2")
+    assert arp.update_playlist(state_path=path) == ("pl2", 1)
+    assert replaces == ["pl", "pl", "pl2"]
+
+
+def test_update_playlist_fails_run_while_searches_pending(tmp_path, monkeypatch):
+    """The playlist is written, but the run fails so CI can re-run the window."""
+    start = _utc(2025, 3, 20, 2)
+    tracks = [{"title": "Flaky", "artists": ["A"], "spotify_id": None, "timestamp": start},
+              {"title": "Ok", "artists": ["A"], "spotify_id": "id1", "timestamp": start}]
+    replaces = []
+
+    def fake_search(query, headers):
+        error = arp.requests.HTTPError("HTTP 503", response=DummyResponse(status_code=503))
+        raise RuntimeError(f"Search request failed for '{query}'") from error
+
+    _stub_spotify_run(monkeypatch, start, tracks, fake_search,
+                      lambda pid, uris, h: replaces.append(uris))
+    path = str(tmp_path / "state.json")
+    with pytest.raises(RuntimeError, match="1 searches failed"):
+        arp.update_playlist(state_path=path)
+    assert replaces == [["spotify:track:id1"]]
+    assert arp.RunCheckpoint.load(path, start, start + timedelta(hours=2)).completed is False
+
+
+# ---------------------------------------------------------------------------
+# Adaptive timeouts and hedged GETs
+# ---------------------------------------------------------------------------
+
+def _warm(endpoint, seconds, n=None):
+    for _ in range(n or arp.LATENCY_MIN_SAMPLES):
+        endpoint.record(seconds)
+
+
+def test_adaptive_timeout_tracks_p99():
+    endpoint = arp.EndpointLatency("test", default_timeout=10)
+    assert endpoint.timeout() == 10
+    assert endpoint.hedge_delay() is None
+
+    _warm(endpoint, 1.5)
+    assert endpoint.timeout() == 4.5
+    assert endpoint.hedge_delay() == 1.5
+
+    endpoint.reset()
+    _warm(endpoint, 0.01)
+    assert endpoint.timeout() == arp.ADAPTIVE_TIMEOUT_FLOOR
+
+
+def test_hedged_get_uses_first_response(monkeypatch):
+    """A slow primary is overtaken by the hedge sent after p95."""
+
+    endpoint = arp.ENDPOINT_LATENCY["spotify_search"]
+    _warm(endpoint, 0.01)
+    release = threading.Event()
+    calls = []
+
+    def fake_get(url, headers, params, timeout):
+        calls.append(timeout)
+        assert threading.current_thread().daemon
+        if len(calls) == 1:
+            release.wait(5)
+            return DummyResponse(json_data={"who": "primary"})
+        return DummyResponse(json_data={"who": "hedge"})
+
+    monkeypatch.setattr(arp.requests, "get", fake_get)
+    resp = arp.hedged_get("spotify_search", "http://x", headers={}, params={})
+    release.set()
+    assert resp.json() == {"who": "hedge"}
+    assert calls == [arp.ADAPTIVE_TIMEOUT_FLOOR] * 2
+    assert endpoint.hedges == 1
+    assert endpoint.hedge_wins == 1
+
+
+def test_hedged_get_respects_budget(monkeypatch):
+    """Hedges are capped at the burst plus HEDGE_BUDGET_RATIO of requests."""
+    endpoint = arp.ENDPOINT_LATENCY["xmplaylist_page"]
+    _warm(endpoint, 0.001)
+    monkeypatch.setattr(endpoint, "record", lambda seconds: None)
+    calls = []
+
+    def fake_get(url, headers, params, timeout):
+        calls.append(url)
+        arp.time.sleep(0.02)
+        return DummyResponse()
+
+    monkeypatch.setattr(arp.requests, "get", fake_get)
+    for _ in range(20):
+        arp.hedged_get("xmplaylist_page", "http://x", headers={}, params={})
+    assert endpoint.requests == 20
+    assert arp.HEDGE_BUDGET_BURST <= endpoint.hedges
+    assert endpoint.hedges <= arp.HEDGE_BUDGET_BURST + 20 * arp.HEDGE_BUDGET_RATIO
+    assert len(calls) == endpoint.requests + endpoint.hedges
+
+
+def test_hedged_get_retries_adaptive_timeout_with_default(monkeypatch):
+    """A request that outlives the tightened timeout gets one default-timeout retry."""
+    endpoint = arp.ENDPOINT_LATENCY["xmplaylist_page"]
+    _warm(endpoint, 0.01)
+    calls = []
+
+    def fake_get(url, headers, params, timeout):
+        calls.append(timeout)
+        if timeout < endpoint.default_timeout:
+            raise arp.requests.ReadTimeout("read timed out")
+        return DummyResponse(json_data={"ok": True})
+
+    monkeypatch.setattr(arp.requests, "get", fake_get)
+    resp = arp.hedged_get("xmplaylist_page", "http://x", headers={}, params={})
+    assert resp.json() == {"ok": True}
+    assert calls == [arp.ADAPTIVE_TIMEOUT_FLOOR, endpoint.default_timeout]
+
+
+def test_hedged_get_default_timeout_is_not_retried(monkeypatch):
+    calls = []
+
+    def fake_get(url, headers, params, timeout):
+        calls.append(timeout)
+        raise arp.requests.ReadTimeout("read timed out")
+
+    monkeypatch.setattr(arp.requests, "get", fake_get)
+    with pytest.raises(arp.requests.Timeout):
+        arp.hedged_get("spotify_search", "http://x", headers={}, params={})
+    assert calls == [10]